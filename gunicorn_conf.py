@@ -0,0 +1,18 @@
+import multiprocessing
+import os
+
+# Every endpoint waits on tikwm or the TikTok CDN, so gevent workers let one
+# process serve many requests and long-running downloads at the same time.
+# GUNICORN_WORKER_CLASS=gthread switches to threads where gevent is unavailable.
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gevent")
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+worker_connections = 1000
+threads = int(os.environ.get("GUNICORN_THREADS", 32)) if worker_class == "gthread" else 1
+
+# Worker heartbeats go to tmpfs so a slow disk can't stall them
+if os.path.isdir("/dev/shm"):
+    worker_tmp_dir = "/dev/shm"
+
+# Large videos can take minutes to stream
+timeout = 600
+keepalive = 75
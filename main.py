@@ -1,14 +1,99 @@
-from flask import Flask, request, jsonify, Response, stream_with_context
+from flask import Flask, request, jsonify, Response, redirect
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
+from flask_compress import Compress
+from functools import wraps
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from cachecontrol import CacheControlAdapter
+from cachecontrol.caches.file_cache import FileCache
 import re
 import json
-from urllib.parse import quote, unquote
+from urllib.parse import quote, unquote, urlsplit
+from threading import BoundedSemaphore, Lock, Thread
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from collections import deque
+from cachetools import TTLCache
 import io
 from werkzeug.exceptions import BadRequest
+from werkzeug.wsgi import wrap_file
 import unicodedata
+import logging
+import socket
+import os
+import time
+import hmac
+import hashlib
+import base64
+
+logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'INFO'))
+logger = logging.getLogger(__name__)
+# Werkzeug logs every request under a global lock; keep only its warnings
+logging.getLogger('werkzeug').setLevel(logging.WARNING)
+
+# Bytes read from the CDN per iteration when streaming downloads
+STREAM_CHUNK_SIZE = 128 * 1024
+
+# Large files are fetched as parallel Range segments, a few segments ahead
+# of what the client has drained, to get past a single TCP flow's window
+PARALLEL_MIN_SIZE = 8 * 1024 * 1024
+PARALLEL_SEGMENT_SIZE = 1024 * 1024
+PARALLEL_SEGMENTS_AHEAD = 4
+# Downloads per worker that may fetch in parallel at once; beyond that they
+# stream on their own connection rather than queue behind other clients
+PARALLEL_DOWNLOAD_SLOTS = int(os.environ.get('PARALLEL_DOWNLOAD_SLOTS', 8))
+
+# Downloads point at signed CDN URLs that rotate, so shared caches must not keep them
+DOWNLOAD_CACHE_CONTROL = 'private, no-store'
+
+# Client headers passed to the CDN so downloads can resume and revalidate
+FORWARDED_REQUEST_HEADERS = ('Range', 'If-None-Match', 'If-Modified-Since')
+
+# CDN statuses that mean a cached media URL has expired and should be refetched
+STALE_MEDIA_STATUSES = (403, 404, 410)
+
+# CDN headers passed back to the client alongside the media
+FORWARDED_RESPONSE_HEADERS = ('Content-Range', 'Accept-Ranges', 'ETag', 'Last-Modified')
+
+# Seconds a tikwm video info reply is reused, in process and from disk
+INFO_CACHE_TTL = 600
+
+# (connect, read) timeouts for tikwm lookups: a dead host fails fast
+# instead of holding a worker
+TIKWM_TIMEOUT = (3.05, 7)
+
+# Seconds a signed download token from /info stays valid
+DOWNLOAD_TOKEN_TTL = 600
+
+# Thumbnail quality names mapped to the tikwm cover fields
+_THUMB_QUALITY = {'high': 'cover', 'medium': 'origin_cover', 'low': 'dynamic_cover'}
+
+class ORJSONProvider(JSONProvider):
+    """Serve jsonify responses through orjson"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Send orjson's bytes as-is instead of decoding to str and back
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype='application/json')
 
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
+# Serve /info/ like /info instead of answering with a redirect
+app.url_map.strict_slashes = False
+
+# Gzip the JSON endpoints only; media is already compressed and streamed as-is
+app.config['COMPRESS_MIMETYPES'] = ['application/json', 'text/html']
+app.config['COMPRESS_LEVEL'] = 4
+app.config['COMPRESS_MIN_SIZE'] = 500
+Compress(app)
 
 # Enable CORS for all routes and origins
 CORS(app, resources={
@@ -20,6 +105,106 @@ CORS(app, resources={
     }
 })
 
+# Supported TikTok URL formats as one alternation, so a URL is scanned once
+_VIDEO_ID_RE = re.compile(
+    r'(?:https?://)?(?:'
+    r'(?:www\.|m\.)?tiktok\.com/@[\w.-]+/video/(?P<video>\d+)'
+    r'|(?:vm|vt)\.tiktok\.com/(?P<short>\w+)'
+    r'|(?:www\.|m\.)?tiktok\.com/t/(?P<share>\w+)'
+    r')',
+    re.IGNORECASE
+)
+
+# Characters that are unsafe in download filenames, mapped to '_'
+_INVALID_FILENAME_TRANS = str.maketrans({c: '_' for c in '<>:"/\\|?*@#$%^&()[]{}~`'})
+_MULTI_UNDERSCORE_RE = re.compile(r'_+')
+# Same character set plus anything non-ASCII and '_' itself, for one-pass cleanup
+_UNSAFE_FILENAME_RE = re.compile(r'[<>:"/\\|?*@#$%^&()\[\]{}~`_\x80-\U0010FFFF]+')
+_NON_ALNUM_ID_RE = re.compile(r'[^a-zA-Z0-9]')
+
+# Punctuation allowed in the final filename besides letters and digits
+_FILENAME_PUNCTUATION_STRIP = str.maketrans('', '', '._- ')
+
+class VideoInfo(dict):
+    """tikwm video data with a weak ETag computed once per lookup
+
+    The ETag follows the entry's contents, so a refreshed lookup (new stats,
+    new media URLs) invalidates clients' copies and the tokens signed into
+    them, while every response from the cached entry reuses it.
+    """
+    __slots__ = ('etag',)
+
+    def __init__(self, data):
+        super().__init__(data)
+        digest = hashlib.blake2b(orjson.dumps(data, option=orjson.OPT_SORT_KEYS), digest_size=12)
+        self.etag = digest.hexdigest()
+
+class PrunedFileCache(FileCache):
+    """FileCache that deletes entries older than max_age
+
+    CacheControl's FileCache never evicts, so every distinct URL would leave
+    a file behind for good. Writes start a background prune pass at most
+    once per interval.
+    """
+
+    def __init__(self, directory, max_age, interval=300, **kwargs):
+        super().__init__(directory, **kwargs)
+        self.max_age = max_age
+        self.interval = interval
+        self._next_prune = 0
+        self._prune_lock = Lock()
+
+    def set(self, key, value, expires=None):
+        try:
+            super().set(key, value, expires)
+        except FileNotFoundError:
+            # A prune removed the directory between makedirs and the write
+            super().set(key, value, expires)
+
+        now = time.time()
+        with self._prune_lock:
+            if now < self._next_prune:
+                return
+            self._next_prune = now + self.interval
+        Thread(target=self.prune, daemon=True).start()
+
+    def prune(self):
+        """Remove cache and lock files older than max_age, then empty directories"""
+        cutoff = time.time() - self.max_age
+        for root, dirs, files in os.walk(self.directory, topdown=False):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        os.remove(path)
+                except OSError:
+                    # Another worker pruned it first
+                    pass
+            if root != self.directory:
+                try:
+                    os.rmdir(root)
+                except OSError:
+                    # Still holds live entries
+                    pass
+
+def load_token_secret():
+    """Return the download token key from DOWNLOAD_TOKEN_SECRET, or None
+
+    Every worker must sign with the same key or tokens from one fail on the
+    others, so without the secret tokens are switched off (links still carry
+    url=) except on the single-process development server.
+    """
+    secret = os.environ.get('DOWNLOAD_TOKEN_SECRET', '')
+    if secret:
+        return secret.encode()
+
+    if __name__ == '__main__' or os.environ.get('FLASK_DEV'):
+        logger.warning("DOWNLOAD_TOKEN_SECRET is not set; using a random key for this process")
+        return os.urandom(32)
+
+    logger.warning("DOWNLOAD_TOKEN_SECRET is not set; download tokens are disabled")
+    return None
+
 class TikTokAPI:
     def __init__(self):
         self.headers = {
@@ -27,62 +212,246 @@ class TikTokAPI:
         }
         self.api_url = "https://tikwm.com/api/"
 
+        # Shared session so tikwm and CDN connections are kept alive and pooled
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        retries = Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+        pool_options = {
+            'pool_connections': 50,
+            'pool_maxsize': 100,
+            'max_retries': retries
+        }
+        adapter = HTTPAdapter(**pool_options)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        # tikwm API replies also go through an on-disk HTTP cache that honours
+        # upstream Cache-Control headers and is shared by all workers; files
+        # in HTTP_CACHE_DIR older than INFO_CACHE_TTL are pruned as we go
+        api_adapter = CacheControlAdapter(
+            cache=PrunedFileCache(os.environ.get('HTTP_CACHE_DIR', '/tmp/tiktokapi_cache'), INFO_CACHE_TTL),
+            **pool_options
+        )
+        self.session.mount(self.api_url, api_adapter)
+
+        # Video info cache keyed by normalized URL, so /info followed by a
+        # download does not hit tikwm twice
+        self._info_cache = TTLCache(maxsize=10000, ttl=INFO_CACHE_TTL)
+        self._cache_lock = Lock()
+        self._inflight = {}
+        # Coalesced callers wait out the owner's worst case: every attempt
+        # timing out, the retry backoff in between, plus some slack
+        self._coalesce_wait = (
+            (retries.total + 1) * sum(TIKWM_TIMEOUT)
+            + sum(retries.backoff_factor * 2 ** attempt for attempt in range(retries.total))
+            + 5
+        )
+        self._cache_stats = {'hits': 0, 'misses': 0, 'coalesced': 0, 'negative_hits': 0}
+
+        # Recently failed URLs, so clients retrying a bad link do not hit
+        # tikwm on every attempt
+        self._failed_cache = TTLCache(maxsize=4096, ttl=60)
+
+        # Key for signed download tokens, shared by every worker; set
+        # DOWNLOAD_TOKEN_SECRET to a long random string to enable tokens
+        self.token_secret = load_token_secret()
+
+    def normalize_url(self, url):
+        """Normalize a TikTok URL so equivalent links share a cache key"""
+        url = url.strip()
+        if '://' not in url:
+            url = 'https://' + url
+
+        parts = urlsplit(url)
+        host = parts.netloc.lower()
+        if host.startswith('www.'):
+            host = host[4:]
+
+        # Query strings on share links only carry tracking parameters
+        return host + parts.path.rstrip('/')
+
     def extract_video_id(self, url):
         """Extract video ID from TikTok URL"""
-        patterns = [
-            r'(?:https?://)?(?:www\.)?tiktok\.com/@[\w.-]+/video/(\d+)',
-            r'(?:https?://)?(?:vm\.tiktok\.com|vt\.tiktok\.com)/(\w+)',
-            r'(?:https?://)?(?:www\.)?tiktok\.com/t/(\w+)'
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, url)
-            if match:
-                return match.group(1)
-        return None
-
-    def get_video_info(self, url):
-        """Get video information from TikTok URL"""
+        match = _VIDEO_ID_RE.search(url)
+        if not match:
+            return None
+        return match.group('video') or match.group('short') or match.group('share')
+
+    def is_valid_tiktok_url(self, url):
+        """Check that a URL matches one of the supported TikTok formats"""
+        # Anchored at the start so other hosts can't smuggle a TikTok path
+        # into their query string and have us fetch them
+        return _VIDEO_ID_RE.match(url.strip()) is not None
+
+    def get_video_info(self, url, fresh=False):
+        """Get video information from TikTok URL
+
+        fresh bypasses every cache layer, tikwm's on-disk HTTP cache
+        included, and replaces the cached entry with the new reply.
+        """
+        key = self.normalize_url(url)
+        if fresh:
+            video_info = self._fetch_video_info(url, fresh=True)
+            with self._cache_lock:
+                if video_info:
+                    self._info_cache[key] = video_info
+                else:
+                    self._info_cache.pop(key, None)
+            return video_info
+
+        with self._cache_lock:
+            cached = self._info_cache.get(key)
+            if cached is not None:
+                self._cache_stats['hits'] += 1
+                return cached
+
+            if key in self._failed_cache:
+                self._cache_stats['negative_hits'] += 1
+                return None
+
+            # Coalesce concurrent lookups of the same URL into one upstream call
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+                self._cache_stats['misses'] += 1
+            else:
+                self._cache_stats['coalesced'] += 1
+
+        if not owner:
+            try:
+                return future.result(timeout=self._coalesce_wait)
+            except FutureTimeoutError:
+                return None
+
+        video_info = None
+        try:
+            video_info = self._fetch_video_info(url)
+            with self._cache_lock:
+                if video_info:
+                    self._info_cache[key] = video_info
+                else:
+                    self._failed_cache[key] = True
+        finally:
+            with self._cache_lock:
+                self._inflight.pop(key, None)
+            future.set_result(video_info)
+
+        return video_info
+
+    def cache_stats(self):
+        """Return video info cache counters for monitoring"""
+        with self._cache_lock:
+            return {
+                "size": len(self._info_cache),
+                "maxsize": self._info_cache.maxsize,
+                "ttl": self._info_cache.ttl,
+                **self._cache_stats
+            }
+
+    def _fetch_video_info(self, url, fresh=False):
+        """Query the tikwm API for video information"""
         try:
             params = {
                 'url': url,
                 'hd': '1'
             }
 
-            response = requests.get(self.api_url, params=params, headers=self.headers, timeout=10)
+            # Never accept an on-disk reply older than our own cache TTL, since
+            # its media URLs may have expired; fresh skips the disk cache
+            headers = {'Cache-Control': 'no-cache' if fresh else f'max-age={INFO_CACHE_TTL}'}
+
+            logger.debug("Fetching video info for %s", url)
+            response = self.session.get(self.api_url, params=params, headers=headers, timeout=TIKWM_TIMEOUT)
             response.raise_for_status()
 
-            data = response.json()
+            data = orjson.loads(response.content)
 
-            if data.get('code') == 0:
-                return data.get('data')
+            if data.get('code') == 0 and data.get('data'):
+                return VideoInfo(data['data'])
             else:
+                logger.debug("tikwm returned code %s for %s: %s", data.get('code'), url, data.get('msg'))
                 return None
 
-        except Exception as e:
+        except requests.Timeout as e:
+            logger.warning("tikwm timed out for %s: %s", url, e)
+            return None
+        except requests.ConnectionError as e:
+            logger.warning("Could not connect to tikwm for %s: %s", url, e)
+            return None
+        except requests.HTTPError as e:
+            logger.warning("tikwm returned HTTP %s for %s", e.response.status_code, url)
+            return None
+        except requests.RequestException as e:
+            logger.warning("tikwm request failed for %s: %s", url, e)
+            return None
+        except orjson.JSONDecodeError as e:
+            logger.info("tikwm returned invalid JSON for %s: %s", url, e)
+            return None
+        except Exception:
+            logger.exception("Unexpected error looking up %s", url)
+            return None
+
+    def create_download_token(self, video_info, extension, *media_keys):
+        """Sign media URLs into a short-lived token for the download endpoints
+
+        Only the finished filename is signed, never the free-form title, so
+        long captions cannot push the link past server request-line limits.
+        Returns None when tokens are disabled.
+        """
+        if self.token_secret is None:
+            return None
+
+        payload = {
+            'id': video_info.get('id'),
+            'filename': self.make_filename(video_info, extension),
+            'exp': int(time.time()) + DOWNLOAD_TOKEN_TTL
+        }
+        for media_key in media_keys:
+            payload[media_key] = video_info.get(media_key)
+        body = base64.urlsafe_b64encode(orjson.dumps(payload)).rstrip(b'=')
+        return (body + b'.' + self._sign(body)).decode()
+
+    def read_download_token(self, token):
+        """Return the video info signed into a token, or None if invalid or expired"""
+        if not token or self.token_secret is None:
+            return None
+
+        try:
+            body, signature = token.encode().split(b'.')
+        except ValueError:
             return None
 
+        if not hmac.compare_digest(signature, self._sign(body)):
+            return None
+
+        payload = orjson.loads(base64.urlsafe_b64decode(body + b'=' * (-len(body) % 4)))
+        if payload.get('exp', 0) < time.time():
+            return None
+        return payload
+
+    def _sign(self, body):
+        digest = hmac.new(self.token_secret, body, hashlib.sha256).digest()
+        return base64.urlsafe_b64encode(digest).rstrip(b'=')
+
     def sanitize_filename(self, filename):
         """Remove invalid characters from filename and handle Unicode properly"""
         if not filename:
             return "video"
 
-        # Normalize Unicode characters
-        try:
-            filename = unicodedata.normalize('NFKD', filename)
-        except:
-            pass
-
-        # Remove or replace invalid characters
-        invalid_chars = '<>:"/\\|?*@#$%^&()[]{}~`'
-        for char in invalid_chars:
-            filename = filename.replace(char, '_')
-
-        # Remove any non-ASCII characters that might cause issues
-        filename = ''.join(char if ord(char) < 128 else '_' for char in filename)
+        # Plain ASCII titles need no Unicode normalization or stripping
+        if filename.isascii():
+            # Remove or replace invalid characters
+            filename = filename.translate(_INVALID_FILENAME_TRANS)
 
-        # Replace multiple underscores with single underscore
-        filename = re.sub(r'_+', '_', filename)
+            # Replace multiple underscores with single underscore
+            filename = _MULTI_UNDERSCORE_RE.sub('_', filename)
+        else:
+            # Normalize Unicode, then replace invalid and non-ASCII characters
+            # and collapse underscores in a single pass
+            filename = unicodedata.normalize('NFKD', filename)
+            filename = _UNSAFE_FILENAME_RE.sub('_', filename)
 
         # Remove leading/trailing underscores and spaces
         filename = filename.strip('_ ')
@@ -97,11 +466,22 @@ class TikTokAPI:
 
         return filename
 
+    def make_filename(self, video_info, extension):
+        """Build the download filename for a video's media file"""
+        # Token payloads carry the filename that was built when signing
+        if 'filename' in video_info:
+            return video_info['filename']
+        return self.create_safe_filename(
+            video_info.get('title', ''),
+            video_info.get('author', {}).get('unique_id', ''),
+            video_info.get('id', ''),
+            extension
+        )
+
     def create_safe_filename(self, title, author, video_id, extension):
         """Create a safe filename for downloads with VibeDownloader.me branding"""
         safe_title = self.sanitize_filename(title) if title else "TikTok_Video"
-        safe_author = self.sanitize_filename(author) if author else "user"
-        safe_id = re.sub(r'[^a-zA-Z0-9]', '', str(video_id)) if video_id else "unknown"
+        safe_id = _NON_ALNUM_ID_RE.sub('', str(video_id)) if video_id else "unknown"
 
         # Create filename with VibeDownloader.me branding
         filename = f"VibeDownloader.me - {safe_title}.{extension}"
@@ -114,90 +494,452 @@ class TikTokAPI:
             filename = f"VibeDownloader.me - {truncated_title}.{extension}"
 
         # If still problematic, use fallback
-        if not filename.replace('.', '').replace('_', '').replace('-', '').replace(' ', '').isalnum():
+        if not filename.translate(_FILENAME_PUNCTUATION_STRIP).isalnum():
             filename = f"VibeDownloader.me - {safe_id}.{extension}"
 
         return filename
 
+# Cache DNS answers for tikwm and the CDN hosts so new pool connections
+# skip the resolver round-trip
+_dns_cache = TTLCache(maxsize=1024, ttl=300)
+_dns_lock = Lock()
+_system_getaddrinfo = socket.getaddrinfo
+
+def _cached_getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):
+    """socket.getaddrinfo backed by a short-lived in-process cache"""
+    key = (host, port, family, type, proto, flags)
+    with _dns_lock:
+        cached = _dns_cache.get(key)
+    if cached is not None:
+        return cached
+
+    result = _system_getaddrinfo(host, port, family, type, proto, flags)
+    with _dns_lock:
+        _dns_cache[key] = result
+    return result
+
+def install_dns_cache():
+    """Route all outgoing name resolution through the DNS cache"""
+    socket.getaddrinfo = _cached_getaddrinfo
+
 # Initialize TikTok API
 tiktok_api = TikTokAPI()
+install_dns_cache()
 
-@app.route('/')
-def home():
-    """API documentation"""
-    docs = {
-        "name": "TikTok Downloader API",
-        "version": "1.0",
-        "description": "Download TikTok videos and audio without saving on server",
-        "endpoints": {
-            "/info": {
-                "method": "GET",
-                "description": "Get video information",
-                "parameters": {
-                    "url": "TikTok video URL (required)"
-                },
-                "example": "/info?url=https://www.tiktok.com/@username/video/1234567890"
+def cacheable(response, video_info):
+    """Let browsers and CDNs (or an nginx proxy_cache) cache a video metadata response"""
+    response.headers['Cache-Control'] = 'public, max-age=120'
+    response.set_etag(video_info.etag, weak=True)
+    return response
+
+def open_media_stream(media_url, headers=None):
+    """Open a streaming GET to the CDN, closing it again if the request failed"""
+    # Media is already compressed; asking for identity keeps urllib3's
+    # decoder out of the copy loop
+    headers = {'Accept-Encoding': 'identity', **(headers or {})}
+
+    # (connect, read) timeouts; the read timeout applies to every chunk
+    upstream = tiktok_api.session.get(media_url, headers=headers, stream=True, timeout=(5, 30))
+    # 416 is the CDN's answer to a bad Range and goes back to the client as-is
+    if upstream.status_code != 416:
+        try:
+            upstream.raise_for_status()
+        except requests.HTTPError:
+            upstream.close()
+            raise
+
+    # Only decode if the CDN compressed the body anyway
+    upstream.raw.decode_content = 'Content-Encoding' in upstream.headers
+    return upstream
+
+# Sized so every parallel download slot gets all of its segments in flight
+_segment_executor = ThreadPoolExecutor(
+    max_workers=PARALLEL_DOWNLOAD_SLOTS * PARALLEL_SEGMENTS_AHEAD,
+    thread_name_prefix='segment'
+)
+_parallel_download_slots = BoundedSemaphore(PARALLEL_DOWNLOAD_SLOTS)
+
+def fetch_segment(media_url, start, end):
+    """Fetch bytes start..end (inclusive) of a media file from the CDN"""
+    headers = {'Accept-Encoding': 'identity', 'Range': f'bytes={start}-{end}'}
+    size = end - start + 1
+    with tiktok_api.session.get(media_url, headers=headers, stream=True, timeout=(5, 30)) as segment:
+        segment.raise_for_status()
+        if segment.status_code != 206 or segment.headers.get('Content-Length') != str(size):
+            raise IOError(f"CDN ignored range {start}-{end}")
+        # One read of the known length yields the bytes object we send as-is
+        data = segment.raw.read(size)
+        if len(data) != size:
+            raise IOError(f"CDN closed range {start}-{end} early")
+        return data
+
+class SegmentedDownload:
+    """Response body yielding a media file in order, fetching segments after
+    the first in parallel
+
+    The already open upstream response supplies the first segment while the
+    next ones download. The caller acquires a parallel download slot first;
+    close() releases the upstream stream and pending segments, even if
+    iteration never started (as with HEAD requests), and gives the slot back
+    once no segment fetch is still running.
+    """
+
+    def __init__(self, upstream, media_url, total):
+        self.upstream = upstream
+        self.media_url = media_url
+        self.total = total
+        self._ranges = deque(
+            (start, min(start + PARALLEL_SEGMENT_SIZE, total) - 1)
+            for start in range(PARALLEL_SEGMENT_SIZE, total, PARALLEL_SEGMENT_SIZE)
+        )
+        self._pending = deque()
+        self._closed = False
+
+    def _schedule(self):
+        while self._ranges and len(self._pending) < PARALLEL_SEGMENTS_AHEAD:
+            self._pending.append(
+                _segment_executor.submit(fetch_segment, self.media_url, *self._ranges.popleft())
+            )
+
+    def __iter__(self):
+        try:
+            self._schedule()
+
+            remaining = PARALLEL_SEGMENT_SIZE
+            while remaining:
+                chunk = self.upstream.raw.read(min(STREAM_CHUNK_SIZE, remaining))
+                if not chunk:
+                    raise IOError("CDN closed the stream early")
+                remaining -= len(chunk)
+                yield chunk
+            self.upstream.close()
+
+            while self._pending:
+                segment = self._pending.popleft().result()
+                self._schedule()
+                yield segment
+        except Exception as e:
+            logger.warning("Segmented download of %s failed: %r", self.media_url, e)
+            raise
+        finally:
+            self.close()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self.upstream.close()
+        self._ranges.clear()
+
+        # Fetches already running cannot be cancelled; keep the slot until
+        # they finish so the next download never queues behind them
+        running = [future for future in self._pending if not future.cancel()]
+        self._pending.clear()
+        if not running:
+            _parallel_download_slots.release()
+            return
+
+        remaining = [len(running)]
+        lock = Lock()
+
+        def finished(_future):
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                _parallel_download_slots.release()
+
+        for future in running:
+            future.add_done_callback(finished)
+
+def requested_url():
+    """Return the 'url' parameter from the query string, or from a POST body
+
+    Anything but a string (a JSON array body, a numeric url) counts as missing.
+    """
+    url = request.args.get('url')
+    if url is None and request.method == 'POST':
+        body = request.get_json(silent=True)
+        if body is None:
+            body = request.form
+        if not isinstance(body, dict):
+            return None
+        url = body.get('url')
+    return url if isinstance(url, str) else None
+
+def lookup_requested_video():
+    """Validate the 'url' parameter and fetch its video info
+
+    Returns (url, video_info, None), or (url, None, error_response) when the
+    URL is missing, unsupported or the lookup failed.
+    """
+    url = requested_url()
+    if not url:
+        return url, None, (jsonify({
+            "error": "Missing 'url' parameter",
+            "message": "Please provide a TikTok URL"
+        }), 400)
+
+    if not tiktok_api.is_valid_tiktok_url(url):
+        return url, None, (jsonify({
+            "error": "Invalid TikTok URL",
+            "message": "Please provide a supported TikTok video URL"
+        }), 400)
+
+    # Get video info
+    video_info = tiktok_api.get_video_info(url)
+    if not video_info:
+        return url, None, (jsonify({
+            "error": "Failed to fetch video information",
+            "message": "Invalid URL or video not accessible"
+        }), 404)
+
+    return url, video_info, None
+
+def require_video_info(media_key=None):
+    """Resolve the requested video before the view runs and pass it in
+
+    media_key is the tikwm field the view streams, or a function returning
+    it. A valid signed download token that carries that field is used
+    instead of looking the URL up again; any other token falls back to url.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            url = requested_url()
+            video_info = None
+            if media_key is not None:
+                video_info = tiktok_api.read_download_token(request.args.get('token'))
+                key = media_key() if callable(media_key) else media_key
+                if video_info and not video_info.get(key):
+                    video_info = None
+
+            if not video_info:
+                url, video_info, error = lookup_requested_video()
+                if error is not None:
+                    return error
+            elif url and not tiktok_api.is_valid_tiktok_url(url):
+                # The token alone is trusted; never refetch an unchecked url
+                url = None
+
+            return view(*args, url=url, video_info=video_info, **kwargs)
+        return wrapper
+    return decorator
+
+def open_fresh_media_stream(media_url, headers, video_info, media_key, url):
+    """Open the media stream, refetching an expired media URL once via url"""
+    try:
+        return open_media_stream(media_url, headers=headers)
+    except requests.HTTPError as e:
+        # Signed CDN URLs expire before our cache entry does; drop the stale
+        # lookup and retry once with a freshly fetched media URL
+        if not url or e.response is None or e.response.status_code not in STALE_MEDIA_STATUSES:
+            raise
+        fresh_info = tiktok_api.get_video_info(url, fresh=True)
+        if not fresh_info or str(fresh_info.get('id')) != str(video_info.get('id')):
+            raise
+        media_url = fresh_info.get(media_key)
+        if not media_url:
+            raise
+        return open_media_stream(media_url, headers=headers)
+
+def media_error_response(error):
+    """Answer a failed CDN request without echoing the signed CDN URL"""
+    status = getattr(error.response, 'status_code', None)
+    logger.warning("CDN request failed with %s: %s", status, error)
+    if status in (404, 410):
+        return jsonify({
+            "error": "Media not found",
+            "message": "The file is no longer available on TikTok's CDN"
+        }), 404
+    return jsonify({
+        "error": "Upstream error",
+        "message": "Could not fetch the file from TikTok's CDN"
+    }), 502
+
+def stream_asset(video_info, media_key, mimetype, extension, not_found, url=None):
+    """Stream one of a video's media files from the CDN
+
+    media_key is the tikwm field holding the media URL; not_found is the
+    (error, message) pair returned with a 404 when that field is empty.
+    When url is given (already validated), an expired media URL is
+    refetched once, provided the url still resolves to the same video.
+    """
+    media_url = video_info.get(media_key)
+    if not media_url:
+        error, message = not_found
+        return jsonify({
+            "error": error,
+            "message": message
+        }), 404
+
+    # proxy=0 sends the client to the CDN itself, freeing the worker at once;
+    # browsers ignore Content-Disposition on redirects, so this stays opt-in
+    if request.args.get('proxy') == '0':
+        response = redirect(media_url, code=302)
+        response.headers['Cache-Control'] = DOWNLOAD_CACHE_CONTROL
+        return response
+
+    # Stream the file straight from the upstream socket, forwarding the
+    # client's Range and conditional headers so downloads can resume
+    forwarded = {name: request.headers[name]
+                 for name in FORWARDED_REQUEST_HEADERS if name in request.headers}
+    try:
+        upstream = open_fresh_media_stream(media_url, forwarded, video_info, media_key, url)
+    except requests.RequestException as e:
+        return media_error_response(e)
+
+    filename = tiktok_api.make_filename(video_info, extension)
+    headers = {
+        'Content-Disposition': f'attachment; filename="{filename}"',
+        'Content-Type': mimetype,
+        'Cache-Control': DOWNLOAD_CACHE_CONTROL
+    }
+    for name in FORWARDED_RESPONSE_HEADERS:
+        if name in upstream.headers:
+            headers[name] = upstream.headers[name]
+
+    if upstream.status_code == 304:
+        upstream.close()
+        return Response(status=304, headers=headers)
+
+    # Pass the size through so clients can show progress; a compressed
+    # upstream length would not match the decoded bytes we send
+    content_length = upstream.headers.get('Content-Length')
+    if content_length and 'Content-Encoding' not in upstream.headers:
+        headers['Content-Length'] = content_length
+
+    if (upstream.status_code == 200 and 'Content-Length' in headers
+            and upstream.headers.get('Accept-Ranges') == 'bytes'
+            and int(content_length) >= PARALLEL_MIN_SIZE
+            and _parallel_download_slots.acquire(blocking=False)):
+        body = SegmentedDownload(upstream, media_url, int(content_length))
+    else:
+        # Use the server's wsgi.file_wrapper when it offers one, so it can take
+        # over the copy loop (and use sendfile where the source allows it)
+        body = wrap_file(request.environ, upstream.raw, STREAM_CHUNK_SIZE)
+
+    return Response(
+        body,
+        status=upstream.status_code,
+        mimetype=mimetype,
+        headers=headers,
+        direct_passthrough=True
+    )
+
+def download_link(name, encoded_url, token=None):
+    """Build a /download link, adding the token when tokens are enabled"""
+    link = f"/download/{name}?url={encoded_url}"
+    if token:
+        link += f"&token={token}"
+    return link
+
+def not_modified(video_info):
+    """Return an empty 304 if the client's cached copy is still current"""
+    if request.if_none_match.contains_weak(video_info.etag):
+        return cacheable(Response(status=304), video_info)
+    return None
+
+# API documentation served at '/', serialized once at import
+API_DOCS = {
+    "name": "TikTok Downloader API",
+    "version": "1.0",
+    "description": "Download TikTok videos and audio without saving on server",
+    "endpoints": {
+        "/info": {
+            "method": "GET",
+            "description": "Get video information",
+            "parameters": {
+                "url": "TikTok video URL (required)"
             },
-            "/download/video": {
-                "method": "GET",
-                "description": "Download video file",
-                "parameters": {
-                    "url": "TikTok video URL (required)"
-                },
-                "example": "/download/video?url=https://www.tiktok.com/@username/video/1234567890"
+            "example": "/info?url=https://www.tiktok.com/@username/video/1234567890"
+        },
+        "/session": {
+            "method": "POST",
+            "description": "Get signed download tokens that skip the metadata lookup on download (empty when the server has tokens disabled)",
+            "parameters": {
+                "url": "TikTok video URL in a JSON or form body (required)"
             },
-            "/download/audio": {
-                "method": "GET",
-                "description": "Download audio file",
-                "parameters": {
-                    "url": "TikTok video URL (required)"
-                },
-                "example": "/download/audio?url=https://www.tiktok.com/@username/video/1234567890"
+            "example": "POST /session {\"url\": \"https://www.tiktok.com/@username/video/1234567890\"}"
+        },
+        "/download/video": {
+            "method": "GET",
+            "description": "Download video file (Range requests resume partial downloads)",
+            "parameters": {
+                "url": "TikTok video URL (required unless token is given)",
+                "token": "Signed download token from /info (optional, skips the metadata lookup)",
+                "proxy": "Set to 0 to be redirected to the CDN instead of streaming through the API (optional, default: 1)"
             },
-            "/download/thumbnail": {
-                "method": "GET",
-                "description": "Download video thumbnail image",
-                "parameters": {
-                    "url": "TikTok video URL (required)",
-                    "quality": "Thumbnail quality: 'high', 'medium', 'low' (optional, default: 'high')"
-                },
-                "example": "/download/thumbnail?url=https://www.tiktok.com/@username/video/1234567890&quality=high"
+            "example": "/download/video?url=https://www.tiktok.com/@username/video/1234567890"
+        },
+        "/download/audio": {
+            "method": "GET",
+            "description": "Download audio file (Range requests resume partial downloads)",
+            "parameters": {
+                "url": "TikTok video URL (required unless token is given)",
+                "token": "Signed download token from /info (optional, skips the metadata lookup)",
+                "proxy": "Set to 0 to be redirected to the CDN instead of streaming through the API (optional, default: 1)"
             },
-            "/thumbnails": {
-                "method": "GET",
-                "description": "Get all available thumbnail URLs",
-                "parameters": {
-                    "url": "TikTok video URL (required)"
-                },
-                "example": "/thumbnails?url=https://www.tiktok.com/@username/video/1234567890"
-            }
+            "example": "/download/audio?url=https://www.tiktok.com/@username/video/1234567890"
         },
-        "supported_formats": [
-            "https://www.tiktok.com/@username/video/1234567890",
-            "https://vm.tiktok.com/ZMxxxxxx/",
-            "https://vt.tiktok.com/ZSxxxxxx/"
-        ]
-    }
-    return jsonify(docs)
+        "/download/thumbnail": {
+            "method": "GET",
+            "description": "Download video thumbnail image",
+            "parameters": {
+                "url": "TikTok video URL (required unless token is given)",
+                "token": "Signed download token from /info (optional, skips the metadata lookup)",
+                "proxy": "Set to 0 to be redirected to the CDN instead of streaming through the API (optional, default: 1)",
+                "quality": "Thumbnail quality: 'high', 'medium', 'low' (optional, default: 'high')"
+            },
+            "example": "/download/thumbnail?url=https://www.tiktok.com/@username/video/1234567890&quality=high"
+        },
+        "/thumbnails": {
+            "method": "GET",
+            "description": "Get all available thumbnail URLs",
+            "parameters": {
+                "url": "TikTok video URL (required)"
+            },
+            "example": "/thumbnails?url=https://www.tiktok.com/@username/video/1234567890"
+        }
+    },
+    "supported_formats": [
+        "https://www.tiktok.com/@username/video/1234567890",
+        "https://vm.tiktok.com/ZMxxxxxx/",
+        "https://vt.tiktok.com/ZSxxxxxx/"
+    ]
+}
+_API_DOCS_JSON = orjson.dumps(API_DOCS)
+_API_DOCS_ETAG = hashlib.sha1(_API_DOCS_JSON).hexdigest()
+
+# Static error bodies, serialized once
+_NOT_FOUND_JSON = orjson.dumps({
+    "error": "Endpoint not found",
+    "message": "Please check the API documentation at '/'"
+})
+_INTERNAL_ERROR_JSON = orjson.dumps({
+    "error": "Internal server error",
+    "message": "Something went wrong on our end"
+})
+
+@app.route('/')
+def home():
+    """API documentation"""
+    response = Response(_API_DOCS_JSON, mimetype='application/json')
+    response.headers['Cache-Control'] = 'public, max-age=3600'
+    response.set_etag(_API_DOCS_ETAG)
+    return response.make_conditional(request)
 
 @app.route('/info', methods=['GET'])
-def get_info():
+@require_video_info()
+def get_info(url, video_info):
     """Get TikTok video information"""
     try:
-        url = request.args.get('url')
-        if not url:
-            return jsonify({
-                "error": "Missing 'url' parameter",
-                "message": "Please provide a TikTok URL"
-            }), 400
-
-        # Get video info
-        video_info = tiktok_api.get_video_info(url)
-        if not video_info:
-            return jsonify({
-                "error": "Failed to fetch video information",
-                "message": "Invalid URL or video not accessible"
-            }), 404
+        cached_response = not_modified(video_info)
+        if cached_response is not None:
+            return cached_response
+
+        # Percent-encode the URL once for all the download links below
+        encoded_url = quote(url, safe='')
 
         # Extract relevant information
         info = {
@@ -226,15 +968,18 @@ def get_info():
                     "dynamic_cover": video_info.get('dynamic_cover')
                 },
                 "download_urls": {
-                    "video": f"/download/video?url={quote(url)}",
-                    "audio": f"/download/audio?url={quote(url)}",
-                    "thumbnail": f"/download/thumbnail?url={quote(url)}",
-                    "thumbnails_info": f"/thumbnails?url={quote(url)}"
+                    "video": download_link('video', encoded_url,
+                                           tiktok_api.create_download_token(video_info, 'mp4', 'play')),
+                    "audio": download_link('audio', encoded_url,
+                                           tiktok_api.create_download_token(video_info, 'mp3', 'music')),
+                    "thumbnail": download_link('thumbnail', encoded_url,
+                                               tiktok_api.create_download_token(video_info, 'jpg', *_THUMB_QUALITY.values())),
+                    "thumbnails_info": f"/thumbnails?url={encoded_url}"
                 }
             }
         }
 
-        return jsonify(info)
+        return cacheable(jsonify(info), video_info)
 
     except Exception as e:
         return jsonify({
@@ -242,59 +987,54 @@ def get_info():
             "message": str(e)
         }), 500
 
+@app.route('/session', methods=['POST'])
+@require_video_info()
+def create_session(url, video_info):
+    """Sign download tokens so the downloads skip the metadata lookup"""
+    try:
+        # The url rides along so expired or rejected tokens still resolve
+        encoded_url = quote(url, safe='')
+        media = (
+            ('video', 'mp4', ('play',)),
+            ('audio', 'mp3', ('music',)),
+            ('thumbnail', 'jpg', tuple(_THUMB_QUALITY.values()))
+        )
+
+        # Tokens are left out entirely when DOWNLOAD_TOKEN_SECRET is unset
+        tokens = {}
+        for name, extension, media_keys in media:
+            token = tiktok_api.create_download_token(video_info, extension, *media_keys)
+            if token:
+                tokens[name] = token
+
+        return jsonify({
+            "success": True,
+            "data": {
+                "id": video_info.get('id'),
+                "expires_in": DOWNLOAD_TOKEN_TTL,
+                "tokens": tokens,
+                "download_urls": {
+                    name: download_link(name, encoded_url, tokens.get(name))
+                    for name, _, _ in media
+                }
+            }
+        })
+
+    except Exception as e:
+        return jsonify({
+            "error": "Failed to create download session",
+            "message": str(e)
+        }), 500
+
 @app.route('/download/video', methods=['GET'])
-def download_video():
+@require_video_info(media_key='play')
+def download_video(url, video_info):
     """Download TikTok video"""
     try:
-        url = request.args.get('url')
-        if not url:
-            return jsonify({
-                "error": "Missing 'url' parameter",
-                "message": "Please provide a TikTok URL"
-            }), 400
-
-        # Get video info
-        video_info = tiktok_api.get_video_info(url)
-        if not video_info:
-            return jsonify({
-                "error": "Failed to fetch video information",
-                "message": "Invalid URL or video not accessible"
-            }), 404
-
-        video_url = video_info.get('play')
-        if not video_url:
-            return jsonify({
-                "error": "Video URL not found",
-                "message": "This video may not be available for download"
-            }), 404
-
-        # Generate safe filename
-        title = video_info.get('title', '')
-        author = video_info.get('author', {}).get('unique_id', '')
-        video_id = video_info.get('id', '')
-
-        filename = tiktok_api.create_safe_filename(title, author, video_id, 'mp4')
-
-        # Stream the video file
-        def generate():
-            try:
-                response = requests.get(video_url, headers=tiktok_api.headers, stream=True)
-                response.raise_for_status()
-
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        yield chunk
-            except Exception as e:
-                yield b''
-
-        return Response(
-            stream_with_context(generate()),
-            mimetype='video/mp4',
-            headers={
-                'Content-Disposition': f'attachment; filename="{filename}"',
-                'Content-Type': 'video/mp4'
-            }
-        )
+        return stream_asset(video_info, 'play', 'video/mp4', 'mp4', (
+            "Video URL not found",
+            "This video may not be available for download"
+        ), url=url)
 
     except Exception as e:
         return jsonify({
@@ -303,24 +1043,15 @@ def download_video():
         }), 500
 
 @app.route('/thumbnails', methods=['GET'])
-def get_thumbnails():
+@require_video_info()
+def get_thumbnails(url, video_info):
     """Get all available thumbnail URLs"""
     try:
-        url = request.args.get('url')
-        if not url:
-            return jsonify({
-                "error": "Missing 'url' parameter",
-                "message": "Please provide a TikTok URL"
-            }), 400
-
-        # Get video info
-        video_info = tiktok_api.get_video_info(url)
-        if not video_info:
-            return jsonify({
-                "error": "Failed to fetch video information",
-                "message": "Invalid URL or video not accessible"
-            }), 404
+        cached_response = not_modified(video_info)
+        if cached_response is not None:
+            return cached_response
 
+        encoded_url = quote(url, safe='')
         thumbnails = {
             "success": True,
             "data": {
@@ -328,14 +1059,14 @@ def get_thumbnails():
                 "origin_cover": video_info.get('origin_cover'), 
                 "dynamic_cover": video_info.get('dynamic_cover'),
                 "download_urls": {
-                    "cover": f"/download/thumbnail?url={quote(url)}&quality=high",
-                    "origin_cover": f"/download/thumbnail?url={quote(url)}&quality=medium", 
-                    "dynamic_cover": f"/download/thumbnail?url={quote(url)}&quality=low"
+                    "cover": f"/download/thumbnail?url={encoded_url}&quality=high",
+                    "origin_cover": f"/download/thumbnail?url={encoded_url}&quality=medium", 
+                    "dynamic_cover": f"/download/thumbnail?url={encoded_url}&quality=low"
                 }
             }
         }
 
-        return jsonify(thumbnails)
+        return cacheable(jsonify(thumbnails), video_info)
 
     except Exception as e:
         return jsonify({
@@ -343,71 +1074,21 @@ def get_thumbnails():
             "message": str(e)
         }), 500
 
+def requested_thumbnail_key():
+    """Return the tikwm cover field for the requested thumbnail quality"""
+    # Unknown qualities fall back to the high quality cover
+    quality = request.args.get('quality', 'high').lower()
+    return _THUMB_QUALITY.get(quality, 'cover')
+
 @app.route('/download/thumbnail', methods=['GET'])
-def download_thumbnail():
+@require_video_info(media_key=requested_thumbnail_key)
+def download_thumbnail(url, video_info):
     """Download TikTok video thumbnail"""
     try:
-        url = request.args.get('url')
-        quality = request.args.get('quality', 'high').lower()
-
-        if not url:
-            return jsonify({
-                "error": "Missing 'url' parameter",
-                "message": "Please provide a TikTok URL"
-            }), 400
-
-        # Get video info
-        video_info = tiktok_api.get_video_info(url)
-        if not video_info:
-            return jsonify({
-                "error": "Failed to fetch video information",
-                "message": "Invalid URL or video not accessible"
-            }), 404
-
-        # Select thumbnail based on quality
-        thumbnail_url = None
-        if quality == 'high':
-            thumbnail_url = video_info.get('cover')
-        elif quality == 'medium':
-            thumbnail_url = video_info.get('origin_cover')
-        elif quality == 'low':
-            thumbnail_url = video_info.get('dynamic_cover')
-        else:
-            thumbnail_url = video_info.get('cover')  # Default to high quality
-
-        if not thumbnail_url:
-            return jsonify({
-                "error": "Thumbnail URL not found",
-                "message": "This video may not have available thumbnails"
-            }), 404
-
-        # Generate safe filename
-        title = video_info.get('title', '')
-        author = video_info.get('author', {}).get('unique_id', '')
-        video_id = video_info.get('id', '')
-
-        filename = tiktok_api.create_safe_filename(title, author, video_id, 'jpg')
-
-        # Stream the thumbnail file
-        def generate():
-            try:
-                response = requests.get(thumbnail_url, headers=tiktok_api.headers, stream=True)
-                response.raise_for_status()
-
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        yield chunk
-            except Exception as e:
-                yield b''
-
-        return Response(
-            stream_with_context(generate()),
-            mimetype='image/jpeg',
-            headers={
-                'Content-Disposition': f'attachment; filename="{filename}"',
-                'Content-Type': 'image/jpeg'
-            }
-        )
+        return stream_asset(video_info, requested_thumbnail_key(), 'image/jpeg', 'jpg', (
+            "Thumbnail URL not found",
+            "This video may not have available thumbnails"
+        ), url=url)
 
     except Exception as e:
         return jsonify({
@@ -416,58 +1097,14 @@ def download_thumbnail():
         }), 500
 
 @app.route('/download/audio', methods=['GET'])
-def download_audio():
+@require_video_info(media_key='music')
+def download_audio(url, video_info):
     """Download TikTok audio"""
     try:
-        url = request.args.get('url')
-        if not url:
-            return jsonify({
-                "error": "Missing 'url' parameter",
-                "message": "Please provide a TikTok URL"
-            }), 400
-
-        # Get video info
-        video_info = tiktok_api.get_video_info(url)
-        if not video_info:
-            return jsonify({
-                "error": "Failed to fetch video information",
-                "message": "Invalid URL or video not accessible"
-            }), 404
-
-        audio_url = video_info.get('music')
-        if not audio_url:
-            return jsonify({
-                "error": "Audio URL not found",
-                "message": "This video may not have extractable audio"
-            }), 404
-
-        # Generate safe filename
-        title = video_info.get('title', '')
-        author = video_info.get('author', {}).get('unique_id', '')
-        video_id = video_info.get('id', '')
-
-        filename = tiktok_api.create_safe_filename(title, author, video_id, 'mp3')
-
-        # Stream the audio file
-        def generate():
-            try:
-                response = requests.get(audio_url, headers=tiktok_api.headers, stream=True)
-                response.raise_for_status()
-
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        yield chunk
-            except Exception as e:
-                yield b''
-
-        return Response(
-            stream_with_context(generate()),
-            mimetype='audio/mpeg',
-            headers={
-                'Content-Disposition': f'attachment; filename="{filename}"',
-                'Content-Type': 'audio/mpeg'
-            }
-        )
+        return stream_asset(video_info, 'music', 'audio/mpeg', 'mp3', (
+            "Audio URL not found",
+            "This video may not have extractable audio"
+        ), url=url)
 
     except Exception as e:
         return jsonify({
@@ -489,22 +1126,17 @@ def health_check():
     """Health check endpoint"""
     return jsonify({
         "status": "healthy",
-        "message": "TikTok Downloader API is running"
+        "message": "TikTok Downloader API is running",
+        "cache": tiktok_api.cache_stats()
     })
 
 @app.errorhandler(404)
 def not_found(error):
-    return jsonify({
-        "error": "Endpoint not found",
-        "message": "Please check the API documentation at '/'"
-    }), 404
+    return Response(_NOT_FOUND_JSON, status=404, mimetype='application/json')
 
 @app.errorhandler(500)
 def internal_error(error):
-    return jsonify({
-        "error": "Internal server error",
-        "message": "Something went wrong on our end"
-    }), 500
+    return Response(_INTERNAL_ERROR_JSON, status=500, mimetype='application/json')
 
 if __name__ == '__main__':
     print("🚀 Starting TikTok Downloader API with CORS enabled...")
@@ -515,7 +1147,9 @@ if __name__ == '__main__':
     print("🎵 Download Audio: http://localhost:5000/download/audio?url=TIKTOK_URL")
     print("🖼️  Download Thumbnail: http://localhost:5000/download/thumbnail?url=TIKTOK_URL")
     print("🖼️  Get Thumbnails: http://localhost:5000/thumbnails?url=TIKTOK_URL")
+    print("🔑 Download Session: POST http://localhost:5000/session")
     print("💚 Health Check: http://localhost:5000/health")
     print("\n✅ Ready to accept requests from any domain!")
 
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # Development server only; production runs under gunicorn (see Procfile)
+    app.run(debug=bool(os.environ.get('FLASK_DEV')), host='0.0.0.0', port=5000)